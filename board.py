@@ -5,7 +5,7 @@ import chess.polyglot
 import pygame
 import random
 from minimax import Minimax
-from constants import ROWS, COLS, SQUARE_SIZE, LIGHT, DARK, SELECT, POSSIBLE, FROM_MOVE, TO_MOVE
+from constants import WIDTH, HEIGHT, ROWS, COLS, SQUARE_SIZE, LIGHT, DARK, SELECT, POSSIBLE, FROM_MOVE, TO_MOVE
 
 
 class Board:
@@ -13,6 +13,7 @@ class Board:
     The chess board representation.
     """
     IMAGES = {}
+    SHADOWS = {}
     SOUNDS = {}
     TABLE = {}
     MINIMAX = Minimax()
@@ -27,9 +28,11 @@ class Board:
         self.previous_squares = None
         self.moves = {}
         self.human_turn = True
-        self.book = chess.polyglot.open_reader("komodo.bin")
         self.load_images()
         self.load_sounds()
+        self.board_background = self.make_board_background()
+        self.select_background = self.make_background(SELECT, 200)
+        self.move_background = self.make_background(POSSIBLE, 150)
 
     def load_images(self) -> None:
         """
@@ -38,7 +41,25 @@ class Board:
         pieces = ['wp', 'wn', 'wb', 'wr', 'wq',
                   'wk', 'bp', 'bn', 'bb', 'br', 'bq', 'bk']
         for piece in pieces:
-            self.IMAGES[piece] = pygame.image.load('images/' + piece + '.png')
+            image = pygame.image.load('images/' + piece + '.png').convert_alpha()
+            image = pygame.transform.smoothscale(
+                image, (SQUARE_SIZE, SQUARE_SIZE))
+            self.IMAGES[piece] = image
+
+            # shadow piece left behind on the square of a dragged piece
+            alpha = 128
+            shadow = image.copy()
+            shadow.fill((255, 255, 255, alpha), None, pygame.BLEND_RGBA_MULT)
+            self.SHADOWS[piece] = shadow
+
+    def make_background(self, color: Tuple[int, int, int], alpha: int) -> pygame.Surface:
+        """
+        Make a translucent square used to highlight a board square.
+        """
+        background = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+        background.set_alpha(alpha)
+        pygame.draw.rect(background, color, (0, 0, SQUARE_SIZE, SQUARE_SIZE))
+        return background
 
     def load_sounds(self) -> None:
         """
@@ -50,15 +71,23 @@ class Board:
         for sound in sounds:
             self.SOUNDS[sound] = pygame.mixer.Sound('sfx/' + sound + '.mp3')
 
-    def draw_board(self, win: pygame.display) -> None:
+    def make_board_background(self) -> pygame.Surface:
         """
-        Draw the chess squares.
+        Render the chess squares once so they can be reused every frame.
         """
-        win.fill(DARK)
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(DARK)
         for row in range(ROWS):
             for col in range(row % 2, ROWS, 2):
-                pygame.draw.rect(win, LIGHT, (row * SQUARE_SIZE,
+                pygame.draw.rect(background, LIGHT, (row * SQUARE_SIZE,
                                  col * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+        return background
+
+    def draw_board(self, win: pygame.display) -> None:
+        """
+        Draw the chess squares.
+        """
+        win.blit(self.board_background, (0, 0))
 
     def draw_pieces(self, win: pygame.display, pos: Tuple[int, int]) -> None:
         """
@@ -78,6 +107,7 @@ class Board:
             pygame.draw.rect(win, TO_MOVE, (ch.square_file(self.previous_squares[1]) * SQUARE_SIZE, (
                 ROWS - ch.square_rank(self.previous_squares[1]) - 1) * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
+        piece_blits = []
         for rank in range(ROWS):
             for file in range(COLS):
                 square = ch.square(file, rank)
@@ -86,54 +116,32 @@ class Board:
                     color = colors[piece.color]
                     type = types[piece.piece_type]
                     piece_image = self.IMAGES[color + type]
-                    piece_image = pygame.transform.scale(
-                        piece_image, (SQUARE_SIZE, SQUARE_SIZE))
 
                     if self.selected_square is None or file != ss_file or rank != ss_rank:
-                        win.blit(piece_image, (file * SQUARE_SIZE,
-                                 (ROWS - rank - 1) * SQUARE_SIZE))
+                        piece_blits.append((piece_image, (file * SQUARE_SIZE,
+                                            (ROWS - rank - 1) * SQUARE_SIZE)))
+        win.blits(piece_blits, doreturn=0)
 
         if self.selected_square is not None:
             color = colors[self.selected_piece.color]
             type = types[self.selected_piece.piece_type]
 
             # draw select background
-            alpha = 200
-            select_background = pygame.Surface(
-                (SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-            select_background.set_alpha(alpha)
-            pygame.draw.rect(select_background, SELECT,
-                             (0, 0, SQUARE_SIZE, SQUARE_SIZE))
-            win.blit(select_background, (ss_file * SQUARE_SIZE,
+            win.blit(self.select_background, (ss_file * SQUARE_SIZE,
                      (ROWS - ss_rank - 1) * SQUARE_SIZE))
 
             # draw shadow piece
-            alpha = 128
-            image = self.IMAGES[color + type].copy()
-            image.fill((255, 255, 255, alpha), None, pygame.BLEND_RGBA_MULT)
-            win.blit(image, (ss_file * SQUARE_SIZE,
+            win.blit(self.SHADOWS[color + type], (ss_file * SQUARE_SIZE,
                      (ROWS - ss_rank - 1) * SQUARE_SIZE))
 
             # draw moves background
-            alpha = 150
-            for move in self.board.legal_moves:
-                if move.from_square == self.selected_square:
-                    to_square = move.to_square
-                    # default to promoting to queen
-                    move.promotion = ch.QUEEN if move.promotion is not None else None
-                    self.moves[ch.square_name(to_square)] = move
-
-            for move in self.moves:
-                to_square = ch.parse_square(move)
+            move_blits = []
+            for to_square in self.moves:
                 to_square_file = ch.square_file(to_square)
                 to_square_rank = ch.square_rank(to_square)
-                move_background = pygame.Surface(
-                    (SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-                move_background.set_alpha(alpha)
-                pygame.draw.rect(move_background, POSSIBLE,
-                                 (0, 0, SQUARE_SIZE, SQUARE_SIZE))
-                win.blit(move_background, (to_square_file * SQUARE_SIZE,
-                         (ROWS - to_square_rank - 1) * SQUARE_SIZE))
+                move_blits.append((self.move_background, (to_square_file * SQUARE_SIZE,
+                                   (ROWS - to_square_rank - 1) * SQUARE_SIZE)))
+            win.blits(move_blits, doreturn=0)
 
             # draw piece at cursor
             # 50 px to center on cursor
@@ -152,6 +160,12 @@ class Board:
                 self.selected_square = square
                 self.selected_piece = piece
 
+                for move in self.board.legal_moves:
+                    if move.from_square == square:
+                        # default to promoting to queen
+                        move.promotion = ch.QUEEN if move.promotion is not None else None
+                        self.moves[move.to_square] = move
+
     def release_square(self, pos: Tuple[int, int], win: pygame.display) -> None:
         """
         Release piece at the square.
@@ -159,10 +173,10 @@ class Board:
         file, rank = pos[0] // SQUARE_SIZE, ROWS - (pos[1] // SQUARE_SIZE) - 1
         square = ch.square(file, rank)
 
-        if ch.square_name(square) in self.moves:
+        if square in self.moves:
             self.previous_squares = (self.selected_square, square)
-            self.play_move_sound(self.moves[ch.square_name(square)])
-            self.board.push(self.moves[ch.square_name(square)])
+            self.play_move_sound(self.moves[square])
+            self.board.push(self.moves[square])
             self.play_state_sound()
 
             self.selected_piece = None
@@ -173,7 +187,8 @@ class Board:
             self.draw_pieces(win, pos)
             pygame.display.update()
 
-            self.ai_move()
+            if not self.quit():
+                self.ai_move()
 
         self.selected_piece = None
         self.selected_square = None
@@ -210,8 +225,7 @@ class Board:
         Play the AI move.
         """
         self.human_turn = False
-        possible_moves = [
-            entry.move for entry in self.book.find_all(self.board)]
+        possible_moves = self.MINIMAX.get_book_moves(self.board)
         if possible_moves:
             move = random.choice(possible_moves)
         else:
@@ -222,10 +236,16 @@ class Board:
         self.board.push(move)
         self.play_state_sound()
         self.human_turn = True
+        self.quit()
 
-    def quit(self) -> None:
+    def quit(self) -> bool:
         """
-        Quit the Pygame window and game.
+        Quit the Pygame window and game if the game is over, and return
+        whether it is. Only needs checking after a move is pushed.
         """
         if self.board.is_game_over():
-            pygame.quit()
+            self.MINIMAX.close_pool()
+            # let the main loop shut pygame down once it stops drawing
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+            return True
+        return False
@@ -2,14 +2,15 @@ import pygame
 from constants import WIDTH, HEIGHT, FPS
 from board import Board
 
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-board = Board()
-
 
 def main() -> None:
     """
     The main function. Start the pygame window and the game.
     """
+    # created here rather than at import so the search worker processes,
+    # which re-import this module on spawn-based platforms, open no window
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    board = Board()
     run = True
     clock = pygame.time.Clock()
 
@@ -35,8 +36,6 @@ def main() -> None:
         board.draw_pieces(WIN, pygame.mouse.get_pos())
         pygame.display.update()
 
-        board.quit()
-
     pygame.quit()
 
 
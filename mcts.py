@@ -4,8 +4,8 @@ Chess move search using the Monte Carlo Tree Search Algorithm.
 
 from __future__ import annotations
 import chess
-import math
 import random
+from math import log, sqrt
 
 
 class Node:
@@ -21,6 +21,7 @@ class Node:
     wins: number of wins from this node
     children: the list of children Nodes
     """
+    MAX_ROLLOUT_PLIES = 200
 
     def __init__(self, state: chess.Board, parent: Node = None, move: chess.Move = None) -> None:
         """
@@ -39,13 +40,19 @@ class Node:
         """
         node = self
         while node.children:
-            unexplored_children = [
-                child for child in node.children if child.visits == 0]
-            if unexplored_children:
-                return random.choice(unexplored_children)
-            else:
-                node = max(node.children, key=lambda child: child.wins / child.visits +
-                           1.4 * math.sqrt(math.log(child.parent.visits + 1) / (child.visits + 1)))
+            # the exploration term's numerator is shared by every child
+            log_visits = log(node.visits + 1)
+            best_child = None
+            best_value = float('-inf')
+            for child in node.children:
+                if child.visits == 0:
+                    return child
+                value = child.wins / child.visits + \
+                    1.4 * sqrt(log_visits / (child.visits + 1))
+                if value > best_value:
+                    best_value = value
+                    best_child = child
+            node = best_child
         return node
 
     def expand(self) -> None:
@@ -54,7 +61,7 @@ class Node:
         """
         legal_moves = list(self.state.legal_moves)
         for move in legal_moves:
-            state = self.state.copy()
+            state = self.state.copy(stack=False)
             state.push(move)
             self.children.append(Node(state, self, move))
 
@@ -62,25 +69,37 @@ class Node:
         """
         Simulate/rollout a random game from the state.
         """
-        state = self.state.copy()
-        while not state.is_game_over():
-            legal_moves = list(state.legal_moves)
-            state.push(random.choice(legal_moves))
-        result = state.result()
-        if result == "1-0":
-            return 1
-        elif result == "0-1":
-            return -1
+        state = self.state.copy(stack=False)
+        # only the cheap terminal checks run per ply, rollouts that hit the
+        # fifty-move rule, dead material or the ply cap are scored as draws
+        ply = 0
+        while ply < self.MAX_ROLLOUT_PLIES and state.halfmove_clock < 100 \
+                and not state.is_insufficient_material():
+            # reservoir sample a uniformly random move without building a list
+            move = None
+            count = 0
+            for legal_move in state.generate_legal_moves():
+                count += 1
+                if random.random() * count < 1:
+                    move = legal_move
+            if move is None:
+                break
+            state.push(move)
+            ply += 1
+        # the side to move is the one that was mated
+        if state.is_checkmate():
+            return -1 if state.turn == chess.WHITE else 1
         return 0
 
     def backpropagate(self, result) -> None:
         """
         Backpropogate the result to the other nodes.
         """
-        self.visits += 1
-        self.wins += result
-        if self.parent:
-            self.parent.backpropagate(result)
+        node = self
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            node = node.parent
 
 
 class MCTS:
@@ -2,18 +2,44 @@
 Minimax algorithm to find the best chess move from a given board state.
 """
 
-from typing import Tuple
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
+import atexit
 import chess
 import chess.polyglot
+import multiprocessing
+import multiprocessing.pool
+import os
 import random
 import time
 
+try:
+    import numba
+    import numpy as np
+except ImportError:  # numba is optional, evaluation falls back to Python
+    numba = None
+
+"""
+Opening book shared by every search.
+"""
+
+BOOK = chess.polyglot.MemoryMappedReader("komodo.bin")
+
+"""
+Transposition table entry flags.
+"""
+
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
 """
 Piece evaluation tables.
 """
 
-pawn_table = [
+pawn_table = array('i', [
     0,  0,  0,  0,  0,  0,  0,  0,
     50, 50, 50, 50, 50, 50, 50, 50,
     10, 10, 20, 30, 30, 20, 10, 10,
@@ -22,9 +48,9 @@ pawn_table = [
     5, -5, -10,  0,  0, -10, -5,  5,
     5, 10, 10, -20, -20, 10, 10,  5,
     0,  0,  0,  0,  0,  0,  0,  0
-]
+])
 
-knight_table = [
+knight_table = array('i', [
     -50, -40, -30, -30, -30, -30, -40, -50,
     -40, -20,  0,  0,  0,  0, -20, -40,
     -30,  0, 10, 15, 15, 10,  0, -30,
@@ -33,9 +59,9 @@ knight_table = [
     -30,  5, 10, 15, 15, 10,  5, -30,
     -40, -20,  0,  5,  5,  0, -20, -40,
     -50, -90, -30, -30, -30, -30, -90, -50
-]
+])
 
-bishop_table = [
+bishop_table = array('i', [
     -20, -10, -10, -10, -10, -10, -10, -20,
     -10,  0,  0,  0,  0,  0,  0, -10,
     -10,  0,  5, 10, 10,  5,  0, -10,
@@ -44,9 +70,9 @@ bishop_table = [
     -10, 10, 10, 10, 10, 10, 10, -10,
     -10,  5,  0,  0,  0,  0,  5, -10,
     -20, -10, -90, -10, -10, -90, -10, -20
-]
+])
 
-rook_table = [
+rook_table = array('i', [
     0,  0,  0,  0,  0,  0,  0,  0,
     5, 10, 10, 10, 10, 10, 10,  5,
     -5,  0,  0,  0,  0,  0,  0, -5,
@@ -55,9 +81,9 @@ rook_table = [
     -5,  0,  0,  0,  0,  0,  0, -5,
     -5,  0,  0,  0,  0,  0,  0, -5,
     0,  0,  0,  5,  5,  0,  0,  0
-]
+])
 
-queen_table = [
+queen_table = array('i', [
     -20, -10, -10, -5, -5, -10, -10, -20,
     -10,  0,  0,  0,  0,  0,  0, -10,
     -10,  0,  5,  5,  5,  5,  0, -10,
@@ -66,9 +92,9 @@ queen_table = [
     -10,  5,  5,  5,  5,  5,  0, -10,
     -10,  0,  5,  0,  0,  0,  0, -10,
     -20, -10, -10, 70, -5, -10, -10, -20
-]
+])
 
-king_table = [
+king_table = array('i', [
     -30, -40, -40, -50, -50, -40, -40, -30,
     -30, -40, -40, -50, -50, -40, -40, -30,
     -30, -40, -40, -50, -50, -40, -40, -30,
@@ -77,9 +103,9 @@ king_table = [
     -10, -20, -20, -20, -20, -20, -20, -10,
     20, 20,  0,  0,  0,  0, 20, 20,
     20, 30, 10,  0,  0, 10, 30, 20
-]
+])
 
-king_endgame_table = [
+king_endgame_table = array('i', [
     -50, -40, -30, -20, -20, -30, -40, -50,
     -30, -20, -10,  0,  0, -10, -20, -30,
     -30, -10, 20, 30, 30, 20, -10, -30,
@@ -88,7 +114,66 @@ king_endgame_table = [
     -30, -10, 20, 30, 30, 20, -10, -30,
     -30, -30,  0,  0,  0,  0, -30, -30,
     -50, -30, -30, -30, -30, -30, -30, -50
-]
+])
+
+"""
+Flip a square to the opposite side's perspective. The tables are laid out
+from white's point of view with a8 first, so white pieces are looked up
+through the mirror and black pieces by their square directly.
+"""
+
+MIRROR = [square ^ 56 for square in chess.SQUARES]
+
+"""
+All piece evaluation tables back to back, for the compiled evaluation.
+"""
+
+PIECE_SQUARE_TABLES = pawn_table + knight_table + bishop_table + \
+    rook_table + queen_table + king_table + king_endgame_table
+KING_OFFSET = 5 * 64
+KING_ENDGAME_OFFSET = 6 * 64
+
+
+if numba is not None:
+    # multiplying the lowest set bit by a de Bruijn constant puts a unique
+    # 6-bit pattern in the top bits, which maps back to the bit's square
+    DEBRUIJN = np.uint64(0x03F79D71B4CB0A89)
+    DEBRUIJN_SQUARES = np.zeros(64, dtype=np.int64)
+    for square in chess.SQUARES:
+        DEBRUIJN_SQUARES[((1 << square) * 0x03F79D71B4CB0A89
+                          & chess.BB_ALL) >> 58] = square
+
+    # explicit signatures keep bitboards above 2 ** 63 from compiling a
+    # separate specialization for every mix of int64 and uint64 arguments
+    @numba.njit("int64(uint64, int32[::1], int64, int64)", cache=True)
+    def _table_sum(bitboard: int, tables: np.ndarray, offset: int, flip: int) -> int:
+        """
+        Return the sum of the table entries for the squares set in a bitboard.
+        """
+        score = 0
+        while bitboard:
+            lowest = bitboard & (~bitboard + np.uint64(1))
+            square = DEBRUIJN_SQUARES[(lowest * DEBRUIJN) >> np.uint64(58)]
+            score += tables[offset + (square ^ flip)]
+            bitboard ^= lowest
+        return score
+
+    @numba.njit("int64(" + ", ".join(["uint64"] * 12) + ", int64, int32[::1])", cache=True)
+    def _piece_square_score(wp: int, wn: int, wb: int, wr: int, wq: int, wk: int,
+                            bp: int, bn: int, bb: int, br: int, bq: int, bk: int,
+                            king_offset: int, tables: np.ndarray) -> int:
+        """
+        Return the piece evaluation table score of the given piece bitboards.
+        """
+        return _table_sum(wp, tables, 0, 56) - _table_sum(bp, tables, 0, 0) + \
+            _table_sum(wn, tables, 64, 56) - _table_sum(bn, tables, 64, 0) + \
+            _table_sum(wb, tables, 128, 56) - _table_sum(bb, tables, 128, 0) + \
+            _table_sum(wr, tables, 192, 56) - _table_sum(br, tables, 192, 0) + \
+            _table_sum(wq, tables, 256, 56) - _table_sum(bq, tables, 256, 0) + \
+            _table_sum(wk, tables, king_offset, 56) - \
+            _table_sum(bk, tables, king_offset, 0)
+
+    PIECE_SQUARE_TABLES = np.frombuffer(PIECE_SQUARE_TABLES, dtype=np.int32)
 
 
 class Minimax:
@@ -96,47 +181,171 @@ class Minimax:
     Perform a search using the Minimax algorithm.
     """
     transposition_table = {}
-    book = chess.polyglot.open_reader("komodo.bin")
+    move_cache = OrderedDict()
+    # an entry holds a tuple of ~40 Move objects, about 4.7 KB, so the cache
+    # is capped at roughly 150 MB
+    MOVE_CACHE_SIZE = 1 << 15
+    # bounds check evasions, which can keep giving check back and forth
+    MAX_QUIESCE_PLIES = 8
+    book_cache = {}
+    pool = None
+    FILE_MASKS = [chess.BB_FILES[i] for i in range(8)]
 
     def minimax(self, board: chess.Board, depth: int, alpha: int, beta: int, maxPlayer: bool) -> int:
         """
         Perform the minimax algorithm given a depth.
         """
-        fen = board.fen()
-
-        if fen in self.transposition_table:
-            return self.transposition_table[fen]
+        key = chess.polyglot.zobrist_hash(board)
+
+        tt_move = None
+        entry = self.transposition_table.get(key)
+        if entry is not None:
+            entry_depth, flag, score, tt_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score
+                elif flag == LOWERBOUND:
+                    alpha = max(alpha, score)
+                elif flag == UPPERBOUND:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
 
-        if depth == 0 or board.is_game_over():
-            score = self.evaluate(board)
-            self.transposition_table[fen] = score
+        if board.is_game_over():
+            score = self.terminal_score(board)
+            self.transposition_table[key] = (depth, EXACT, score, None)
             return score
 
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+
+        if depth == 0:
+            best_score = self.quiesce(board, alpha, beta, maxPlayer)
+
         elif maxPlayer:
+            moves = self.order_moves(
+                board, self.get_legal_moves(board, key), tt_move)
             best_score = float('-inf')
-            for move in board.legal_moves:
-                new_board = board.copy()
-                new_board.push(move)
-                score = self.minimax(new_board, depth - 1, alpha, beta, False)
-                best_score = max(best_score, score)
+            for move in moves:
+                board.push(move)
+                score = self.minimax(board, depth - 1, alpha, beta, False)
+                board.pop()
+                if score > best_score:
+                    best_score = score
+                    best_move = move
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break
-            self.transposition_table[fen] = best_score
-            return best_score
 
         else:
+            moves = self.order_moves(
+                board, self.get_legal_moves(board, key), tt_move)
             best_score = float('inf')
-            for move in board.legal_moves:
-                new_board = board.copy()
-                new_board.push(move)
-                score = self.minimax(new_board, depth - 1, alpha, beta, True)
-                best_score = min(best_score, score)
+            for move in moves:
+                board.push(move)
+                score = self.minimax(board, depth - 1, alpha, beta, True)
+                board.pop()
+                if score < best_score:
+                    best_score = score
+                    best_move = move
                 beta = min(beta, best_score)
                 if beta <= alpha:
                     break
-            self.transposition_table[fen] = best_score
-            return best_score
+
+        if best_score <= alpha_orig:
+            flag = UPPERBOUND
+        elif best_score >= beta_orig:
+            flag = LOWERBOUND
+        else:
+            flag = EXACT
+        self.transposition_table[key] = (depth, flag, best_score, best_move)
+        return best_score
+
+    def quiesce(self, board: chess.Board, alpha: int, beta: int, maxPlayer: bool, ply: int = 0) -> int:
+        """
+        Extend the search past the depth limit through captures, and every
+        evasion when in check, so positions are not evaluated in the middle
+        of an exchange.
+        """
+        if board.is_check():
+            # standing pat is not an option in check, so search every evasion
+            moves = tuple(board.generate_legal_moves())
+            if not moves:
+                return min(max(self.terminal_score(board), alpha), beta)
+            if ply >= self.MAX_QUIESCE_PLIES:
+                return min(max(self.evaluate(board), alpha), beta)
+        else:
+            moves = tuple(board.generate_legal_captures())
+            if not moves and not any(board.generate_legal_moves()):
+                return min(max(self.terminal_score(board), alpha), beta)
+
+            stand_pat = self.evaluate(board)
+
+            if maxPlayer:
+                if stand_pat >= beta:
+                    return beta
+                alpha = max(alpha, stand_pat)
+            else:
+                if stand_pat <= alpha:
+                    return alpha
+                beta = min(beta, stand_pat)
+
+        for move in self.order_moves(board, moves, None):
+            board.push(move)
+            score = self.quiesce(board, alpha, beta, not maxPlayer, ply + 1)
+            board.pop()
+            if maxPlayer:
+                if score >= beta:
+                    return beta
+                alpha = max(alpha, score)
+            else:
+                if score <= alpha:
+                    return alpha
+                beta = min(beta, score)
+
+        return alpha if maxPlayer else beta
+
+    def terminal_score(self, board: chess.Board) -> int:
+        """
+        Score a finished game: checkmate through evaluate, and every other
+        ending as a draw.
+        """
+        if board.is_checkmate():
+            return self.evaluate(board)
+        return 0
+
+    def get_legal_moves(self, board: chess.Board, key: int) -> Tuple[chess.Move, ...]:
+        """
+        Return the legal moves of the board, cached by its Zobrist hash.
+        """
+        moves = self.move_cache.get(key)
+        if moves is None:
+            moves = tuple(board.generate_legal_moves())
+            self.move_cache[key] = moves
+            if len(self.move_cache) > self.MOVE_CACHE_SIZE:
+                self.move_cache.popitem(last=False)
+        else:
+            self.move_cache.move_to_end(key)
+        return moves
+
+    def order_moves(self, board: chess.Board, moves: Tuple[chess.Move, ...], tt_move: chess.Move) -> List[chess.Move]:
+        """
+        Order the moves so the transposition table move is searched first,
+        followed by captures in MVV-LVA order and then promotions.
+        """
+        def score(move: chess.Move) -> int:
+            s = 0
+            if move == tt_move:
+                s += 1 << 20
+            victim = board.piece_type_at(move.to_square)
+            if victim:
+                s += (1 << 16) + 10 * victim - \
+                    (board.piece_type_at(move.from_square) or 0)
+            if move.promotion:
+                s += 1 << 15
+            return s
+
+        return sorted(moves, key=score, reverse=True)
 
     def evaluate(self, board: chess.Board) -> int:
         """
@@ -147,32 +356,20 @@ class Minimax:
         elif board.is_checkmate() and board.turn == chess.BLACK:
             return float('inf')
 
-        qw = qb = rw = rb = bw = bb = nw = nb = pw = pb = 0
-        pieces = board.piece_map().values()
-
-        for piece in pieces:
-            if piece.color == chess.WHITE:
-                if piece.piece_type == chess.QUEEN:
-                    qw += 1
-                elif piece.piece_type == chess.ROOK:
-                    rw += 1
-                elif piece.piece_type == chess.BISHOP:
-                    bw += 1
-                elif piece.piece_type == chess.KNIGHT:
-                    nw += 1
-                elif piece.piece_type == chess.PAWN:
-                    pw += 1
-            else:
-                if piece.piece_type == chess.QUEEN:
-                    qb += 1
-                elif piece.piece_type == chess.ROOK:
-                    rb += 1
-                elif piece.piece_type == chess.BISHOP:
-                    bb += 1
-                elif piece.piece_type == chess.KNIGHT:
-                    nb += 1
-                elif piece.piece_type == chess.PAWN:
-                    pb += 1
+        popcount = chess.popcount
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
+
+        qw = popcount(board.queens & white)
+        qb = popcount(board.queens & black)
+        rw = popcount(board.rooks & white)
+        rb = popcount(board.rooks & black)
+        bw = popcount(board.bishops & white)
+        bb = popcount(board.bishops & black)
+        nw = popcount(board.knights & white)
+        nb = popcount(board.knights & black)
+        pw = popcount(board.pawns & white)
+        pb = popcount(board.pawns & black)
 
         whiteMaterial = 9 * qw + 5 * rw + 3 * nw + 3 * bw + 1 * pw
         blackMaterial = 9 * qb + 5 * rb + 3 * nb + 3 * bb + 1 * pb
@@ -197,20 +394,12 @@ class Minimax:
         white_doubled_pawns = 0
         black_doubled_pawns = 0
 
-        for file_index, file_name in enumerate(chess.FILE_NAMES):
-            white_pawns_on_file = 0
-            black_pawns_on_file = 0
-
-            squares_on_file = [chess.square(file_index, rank)
-                               for rank in range(8)]
+        white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+        black_pawns = board.pawns & board.occupied_co[chess.BLACK]
 
-            for square in squares_on_file:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
-                    if piece.color == chess.WHITE:
-                        white_pawns_on_file += 1
-                    else:
-                        black_pawns_on_file += 1
+        for file_mask in self.FILE_MASKS:
+            white_pawns_on_file = chess.popcount(white_pawns & file_mask)
+            black_pawns_on_file = chess.popcount(black_pawns & file_mask)
 
             if white_pawns_on_file > 1:
                 white_doubled_pawns += white_pawns_on_file - 1
@@ -223,22 +412,14 @@ class Minimax:
         """
         Find and return the number of blocked pawns.
         """
-        white_blocked_pawns = 0
-        black_blocked_pawns = 0
-
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece and piece.piece_type == chess.PAWN:
-                color = board.color_at(square)
-                if color == chess.WHITE:
-                    forward_square = square + 8
-                else:
-                    forward_square = square - 8
-                if board.color_at(forward_square) != color and board.piece_at(forward_square):
-                    if color == chess.WHITE:
-                        white_blocked_pawns += 1
-                    else:
-                        black_blocked_pawns += 1
+        white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+        black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+
+        # a pawn is blocked by any piece on the square directly in front
+        white_blocked_pawns = chess.popcount(
+            white_pawns & (board.occupied >> 8))
+        black_blocked_pawns = chess.popcount(
+            black_pawns & (board.occupied << 8) & chess.BB_ALL)
 
         return white_blocked_pawns, black_blocked_pawns
 
@@ -249,34 +430,26 @@ class Minimax:
         white_isolated_pawns = 0
         black_isolated_pawns = 0
 
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece and piece.piece_type == chess.PAWN:
-                color = board.color_at(square)
-                file_idx = chess.square_file(square)
-                if file_idx == 0:
-                    left_file = None
-                    right_file = file_idx + 1
-                elif file_idx == 7:
-                    left_file = file_idx - 1
-                    right_file = None
-                else:
-                    left_file = file_idx - 1
-                    right_file = file_idx + 1
-                adjacent_files = [left_file, right_file]
-                adjacent_pawns = 0
-                for adjacent_file in adjacent_files:
-                    if adjacent_file is not None:
-                        adjacent_square = chess.square(
-                            adjacent_file, chess.square_rank(square))
-                        adjacent_piece = board.piece_at(adjacent_square)
-                        if adjacent_piece and adjacent_piece.piece_type == chess.PAWN and board.color_at(adjacent_square) == color:
-                            adjacent_pawns += 1
-                if adjacent_pawns == 0:
-                    if color == chess.WHITE:
-                        white_isolated_pawns += 1
-                    else:
-                        black_isolated_pawns += 1
+        white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+        black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+
+        # one bit per file that holds at least one pawn of that color
+        white_files = black_files = 0
+        for file_index, file_mask in enumerate(self.FILE_MASKS):
+            if white_pawns & file_mask:
+                white_files |= 1 << file_index
+            if black_pawns & file_mask:
+                black_files |= 1 << file_index
+
+        # a file is isolated when neither neighbouring file has a pawn
+        white_files &= ~((white_files << 1) | (white_files >> 1))
+        black_files &= ~((black_files << 1) | (black_files >> 1))
+
+        for file_index, file_mask in enumerate(self.FILE_MASKS):
+            if (white_files >> file_index) & 1:
+                white_isolated_pawns += chess.popcount(white_pawns & file_mask)
+            if (black_files >> file_index) & 1:
+                black_isolated_pawns += chess.popcount(black_pawns & file_mask)
 
         return white_isolated_pawns, black_isolated_pawns
 
@@ -284,82 +457,171 @@ class Minimax:
         """
         Find and return the evaluation using the piece evaluation tables.
         """
+        if numba is not None:
+            white = board.occupied_co[chess.WHITE]
+            black = board.occupied_co[chess.BLACK]
+            king_offset = KING_OFFSET if phase == 'o' else KING_ENDGAME_OFFSET
+            return _piece_square_score(
+                board.pawns & white, board.knights & white, board.bishops & white,
+                board.rooks & white, board.queens & white, board.kings & white,
+                board.pawns & black, board.knights & black, board.bishops & black,
+                board.rooks & black, board.queens & black, board.kings & black,
+                king_offset, PIECE_SQUARE_TABLES)
+
         score = 0
+        king = king_table if phase == 'o' else king_endgame_table
+        tables = ((chess.PAWN, pawn_table), (chess.KNIGHT, knight_table),
+                  (chess.BISHOP, bishop_table), (chess.ROOK, rook_table),
+                  (chess.QUEEN, queen_table), (chess.KING, king))
 
-        for rank in range(7, -1, -1):
-            for file in range(8):
-                square = chess.square(file, rank)
-                piece = board.piece_at(square)
-                if piece is None:
-                    continue
-                if piece.color == chess.WHITE:
-                    if piece == chess.PAWN:
-                        score += pawn_table[7 - rank][file]
-                    elif piece == chess.KNIGHT:
-                        score += knight_table[7 - rank][file]
-                    elif piece == chess.BISHOP:
-                        score += bishop_table[7 - rank][file]
-                    elif piece == chess.ROOK:
-                        score += rook_table[7 - rank][file]
-                    elif piece == chess.QUEEN:
-                        score += queen_table[7 - rank][file]
-                    elif piece == chess.KING:
-                        if phase == 'o':
-                            score += king_table[7 - rank][file]
-                        else:
-                            score += king_endgame_table[7 - rank][file]
-                else:
-                    if piece == chess.PAWN:
-                        score -= pawn_table[rank][file]
-                    elif piece == chess.KNIGHT:
-                        score -= knight_table[rank][file]
-                    elif piece == chess.BISHOP:
-                        score -= bishop_table[rank][file]
-                    elif piece == chess.ROOK:
-                        score -= rook_table[rank][file]
-                    elif piece == chess.QUEEN:
-                        score -= queen_table[rank][file]
-                    elif piece == chess.KING:
-                        if phase == 'o':
-                            score -= king_table[rank][file]
-                        else:
-                            score -= king_endgame_table[rank][file]
+        for piece_type, table in tables:
+            for square in chess.scan_reversed(board.pieces_mask(piece_type, chess.WHITE)):
+                score += table[MIRROR[square]]
+            for square in chess.scan_reversed(board.pieces_mask(piece_type, chess.BLACK)):
+                score -= table[square]
 
         return score
 
+    def get_book_moves(self, board: chess.Board) -> List[chess.Move]:
+        """
+        Return the opening book moves for the board, cached by its Zobrist hash.
+        """
+        key = chess.polyglot.zobrist_hash(board)
+        moves = self.book_cache.get(key)
+        if moves is None:
+            moves = [entry.move for entry in BOOK.find_all(board)]
+            self.book_cache[key] = moves
+        return moves
+
     def get_best_move(self, board: chess.Board, depth: int, maxPlayer: bool, max_time: int) -> chess.Move:
         """
         Return the best move from the given board state.
         """
-        possible_moves = [entry.move for entry in self.book.find_all(board)]
+        possible_moves = self.get_book_moves(board)
         if possible_moves:
             random_move = random.choice(possible_moves)
             return random_move
 
         start_time = time.time()
-        depth = 1
+        legal_moves = tuple(board.legal_moves)
         best_move = None
-        alpha = float('-inf')
-        beta = float('inf')
-
-        while time.time() - start_time < max_time:
-            best_score = float('-inf') if maxPlayer else float('inf')
-            for move in board.legal_moves:
-                new_board = board.copy()
-                new_board.push(move)
-                score = self.minimax(new_board, depth - 1,
-                                     alpha, beta, not maxPlayer)
-                if maxPlayer:
-                    if score > best_score:
-                        best_score = score
-                        best_move = move
-                    alpha = max(alpha, best_score)
-                else:
-                    if score < best_score:
+        if not legal_moves:
+            return best_move
+
+        # start every search from empty tables so they cannot grow over a game
+        self.clear_tables()
+        root_key = chess.polyglot.zobrist_hash(board)
+        pool = self.get_pool()
+
+        for current_depth in range(1, depth + 1):
+            # search the previous iteration's best move first, here, so its
+            # score can bound the search of the remaining moves
+            moves = self.order_moves(board, legal_moves, best_move)
+            best_move = moves[0]
+            board.push(best_move)
+            best_score = self.minimax(board, current_depth - 1,
+                                      float('-inf'), float('inf'), not maxPlayer)
+            board.pop()
+
+            if maxPlayer:
+                alpha, beta = best_score, float('inf')
+            else:
+                alpha, beta = float('-inf'), best_score
+
+            if pool is None:
+                for move in moves[1:]:
+                    board.push(move)
+                    score = self.minimax(board, current_depth - 1,
+                                         alpha, beta, not maxPlayer)
+                    board.pop()
+                    if maxPlayer:
+                        if score > best_score:
+                            best_score = score
+                            best_move = move
+                        alpha = max(alpha, best_score)
+                    else:
+                        if score < best_score:
+                            best_score = score
+                            best_move = move
+                        beta = min(beta, best_score)
+            else:
+                # split the remaining root moves across the worker processes,
+                # each of which keeps its own transposition table
+                jobs = [(board, root_key, move, current_depth - 1, alpha, beta, not maxPlayer)
+                        for move in moves[1:]]
+                for move, score in zip(moves[1:], pool.map(_search_root_move, jobs)):
+                    if maxPlayer and score > best_score or not maxPlayer and score < best_score:
                         best_score = score
                         best_move = move
-                    beta = min(beta, best_score)
 
-            depth += 1
+            # the next depth takes several times longer, so do not start one
+            # that cannot finish in the remaining time
+            if time.time() - start_time > 0.6 * max_time:
+                break
 
         return best_move
+
+    def clear_tables(self) -> None:
+        """
+        Empty the transposition table and the move cache.
+        """
+        self.transposition_table.clear()
+        self.move_cache.clear()
+
+    def get_pool(self) -> Optional[multiprocessing.pool.Pool]:
+        """
+        Return the pool of search worker processes, starting it on first use,
+        or None when there is only one CPU and the search runs serially.
+        """
+        cpus = os.cpu_count() or 1
+        if cpus < 2:
+            return None
+        if self.pool is None:
+            # spawn rather than fork, so workers never inherit the threads
+            # SDL has started in the game process
+            self.pool = multiprocessing.get_context("spawn").Pool(
+                cpus, initializer=_init_worker)
+            atexit.register(self.close_pool)
+        return self.pool
+
+    def close_pool(self) -> None:
+        """
+        Stop the search worker processes, if they were started.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+
+"""
+Root move search in the worker processes.
+"""
+
+_worker = None
+_worker_root_key = None
+
+
+def _init_worker() -> None:
+    """
+    Create the Minimax instance used by this worker process.
+    """
+    global _worker
+    _worker = Minimax()
+
+
+def _search_root_move(job: Tuple[chess.Board, int, chess.Move, int, int, int, bool]) -> int:
+    """
+    Search the position after a root move and return its score.
+    """
+    global _worker_root_key
+    board, root_key, move, depth, alpha, beta, maxPlayer = job
+    # start from empty tables whenever a new root position arrives
+    if root_key != _worker_root_key:
+        _worker.clear_tables()
+        _worker_root_key = root_key
+    # jobs sent in the same chunk share one unpickled board
+    board.push(move)
+    score = _worker.minimax(board, depth, alpha, beta, maxPlayer)
+    board.pop()
+    return score